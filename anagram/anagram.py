@@ -41,6 +41,44 @@ def word_in_parent(parent_word, child_word):
     # of child_word
     return True, temp_parent_word
 
+def find_pairs_for_word(source_word, word1, word_list):
+    """
+    Find every two-word anagram of source_word
+    where word1 is the first of the two words
+
+    Parameters
+    ----------
+    source_word : str
+        the word we're creating anagrams from
+    word1 : str
+        the first word of each pair
+    word_list : list of str
+        list of words we will attempt to create
+        using the letters left over from word1
+    
+    Outputs
+    -------
+    word_pairs : list of 2-element tuples of str
+        E.g. [("asdf", "qwer"), ...]
+    """
+    word_pairs = []
+    # see if we can make the word out of source_word
+    result1, temp_source_word = word_in_parent(source_word, word1)
+    # if there was a match
+    if result1:
+        # then do it again for the remaining letters in temp_source_word
+        for word2 in word_list:
+            # making a few assumptions here:
+            # 1. The same word is allowed to be found twice
+            # 2. We don't have to use all the letters in source_word
+            result2, temp_source_word = word_in_parent(temp_source_word, word2)
+            # if result2 and result1 and len(temp_source_word) == 0:
+            # if there was a second match
+            if result2:
+                # add it to the results as a tuple
+                word_pairs.append((word1, word2))
+    return word_pairs
+
 def anagram_kata(source_word, word_list):
     """
     Perform the main challenge of creating a list of two-word
@@ -63,21 +101,8 @@ def anagram_kata(source_word, word_list):
     word_pairs = []
     # for each word in word_list
     for word1 in word_list:
-        # see if we can make the word out of source_word
-        result1, temp_source_word = word_in_parent(source_word, word1)
-        # if there was a match
-        if result1:
-            # then do it again for the remaining letters in temp_source_word
-            for word2 in word_list:
-                # making a few assumptions here:
-                # 1. The same word is allowed to be found twice
-                # 2. We don't have to use all the letters in source_word
-                result2, temp_source_word = word_in_parent(temp_source_word, word2)
-                # if result2 and result1 and len(temp_source_word) == 0:
-                # if there was a second match
-                if result2:
-                    # add it to the results as a tuple
-                    word_pairs.append((word1, word2))
+        # find every pair that starts with this word
+        word_pairs += find_pairs_for_word(source_word, word1, word_list)
     # sort the tuples in word_pairs and then make it unique/distinct
     # i.e. ("asdf", "qwer") is the same anagram pair as ("qwer", "asdf")
     word_pairs = list( # convert set to list
@@ -92,17 +117,50 @@ def anagram_kata(source_word, word_list):
     # return list of results
     return word_pairs
 
+def iter_wordlist_file(filename):
+    """
+    Lazily read the words from a word list file, one at a time.
+    The file has a header line, followed by lines of up to six
+    9-character columns of words, indented by two characters.
+
+    Parameters
+    ----------
+    filename : str
+        path to the word list file
+
+    Outputs
+    -------
+    words : generator of str
+    """
+    with open(filename, "r") as f:
+        # skip the header line
+        next(f, None)
+        for l in f:
+            line = l[2:]
+            for i in range(6):
+                word = line[i*9:(i*9)+9].strip()
+                # skip the empty columns
+                if word != "":
+                    yield word
+
+def parse_wordlist_file(filename):
+    """
+    Read all of the words from a word list file into a list
+
+    Parameters
+    ----------
+    filename : str
+        path to the word list file
+
+    Outputs
+    -------
+    words : list of str
+    """
+    return list(iter_wordlist_file(filename))
+
 if __name__ == "__main__":
-    words = []
     source_word = "documenting"
-    with open("wordlist.txt", "r") as f:
-        wordlist_txt = f.readlines()[1:]
-    for l in wordlist_txt:
-        line = l[2:]
-        for i in range(6):
-            words.append(line[i*9:(i*9)+9].strip())
-    while "" in words:
-        words.remove("")
+    words = parse_wordlist_file("wordlist.txt")
     
     word_pairs = anagram_kata(source_word, words)
     print(word_pairs)
@@ -0,0 +1,49 @@
+"""
+Benchmark cases for the anagram kata, picked up by `python -m bench`
+"""
+import random, string
+
+from anagram.anagram import anagram_kata, word_in_parent
+
+SOURCE_WORD = "documenting"
+
+def make_word_list(size, seed=0):
+    """
+    Build a reproducible list of `size` words, a mix of words that can
+    and can't be made out of SOURCE_WORD, as wordlist.txt isn't shipped.
+
+    Parameters
+    ----------
+    size : int
+        the number of words to generate
+    seed : int
+        seed for the random number generator
+
+    Outputs
+    -------
+    words : list of str
+    """
+    rng = random.Random(seed)
+    words = []
+    for i in range(size):
+        length = rng.randint(2, 6)
+        # every other word is built from the letters of SOURCE_WORD
+        # so that the inner loop of anagram_kata actually gets exercised
+        if i % 2 == 0:
+            words.append("".join(rng.sample(SOURCE_WORD, length)))
+        else:
+            words.append("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return words
+
+BENCHMARKS = [
+    {
+        "name": "word_in_parent",
+        "setup": lambda: [(SOURCE_WORD, w) for w in make_word_list(2000)],
+        "run": lambda pairs: [word_in_parent(p, c) for p, c in pairs],
+    },
+    {
+        "name": "anagram_kata_500",
+        "setup": lambda: (SOURCE_WORD, make_word_list(500)),
+        "run": lambda data: anagram_kata(*data),
+    },
+]
@@ -1,4 +1,4 @@
-import sys, string
+import os, sys, string
 
 ARG_SCHEMA = {
     "name": {
@@ -26,6 +26,10 @@ ARG_SCHEMA = {
     }
 }
 
+# response files bigger than this are streamed from disk on every reference
+# rather than having their tokens cached
+RESPONSE_FILE_CACHE_MAX_BYTES = 64 * 1024
+
 args_schema = [
     {
         "name": "l",
@@ -67,6 +71,9 @@ class ArgParser:
     >>>
     ```
 
+    Arguments can also be read from a response file by passing `@path`,
+    e.g. `python args.py @my_args.txt -l`
+
     """
     def __init__(self, args_schema):
         """
@@ -144,22 +151,133 @@ class ArgParser:
                 return True
         return False
 
+    def _tokenize_response_file(self, filename):
+        """
+        Lazily read the response file `filename` and yield each
+        whitespace-separated token in it, one line at a time.
+        Lines starting with a "#" are treated as comments and skipped.
+        Only one line is held in memory at a time.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the response file
+
+        Outputs
+        -------
+        tokens : generator of str
+        """
+        with open(filename, "r") as f:
+            for line in f:
+                # skip comment lines
+                if line.lstrip().startswith("#"):
+                    continue
+                for token in line.split():
+                    yield token
+
+    def _expand_arguments(self, arguments):
+        """
+        Yield each of `arguments` in order, expanding any `@path` argument
+        in place with the tokens of the response file at `path`.
+
+        Parameters
+        ----------
+        arguments : iterable of str
+            The arguments, which may contain `@path` references
+
+        Outputs
+        -------
+        tokens : generator of str
+        """
+        # keep track of which files are currently being expanded
+        # so that files which reference each other don't loop forever
+        active_files = set()
+        # tokens of response files already read during this parse, keyed by absolute path.
+        # This only lives as long as one call to parse_args, so files changed
+        # between calls are always read afresh
+        cache = {}
+        for argument in arguments:
+            if argument.startswith("@") and len(argument) > 1:
+                yield from self._expand_response_file(argument[1:], active_files, cache)
+            else:
+                yield argument
+
+    def _expand_response_file(self, filename, active_files, cache):
+        """
+        Yield the tokens of the response file `filename`, expanding any
+        `@path` references to other response files in place.
+
+        The first reference to a file is streamed straight from disk. Files of
+        up to RESPONSE_FILE_CACHE_MAX_BYTES have their tokens cached so that
+        repeated references don't have to read them again, whereas bigger files
+        are streamed again each time rather than being held in memory.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the response file
+        active_files : set of str
+            Absolute paths of the response files currently being expanded
+        cache : dict
+            Absolute path -> tuple of the tokens of response files already read
+
+        Outputs
+        -------
+        tokens : generator of str
+        """
+        abs_filename = os.path.abspath(filename)
+        if abs_filename in active_files:
+            raise Exception(f"Response file {filename} is referenced recursively.")
+        active_files.add(abs_filename)
+        cached_tokens = cache.get(abs_filename)
+        if cached_tokens is not None:
+            # already read this file, so replay the cached tokens
+            tokens = cached_tokens
+            recorded_tokens = None
+        else:
+            tokens = self._tokenize_response_file(abs_filename)
+            # only record the tokens of files small enough to be worth caching
+            if os.path.getsize(abs_filename) <= RESPONSE_FILE_CACHE_MAX_BYTES:
+                recorded_tokens = []
+            else:
+                recorded_tokens = None
+        for token in tokens:
+            if recorded_tokens is not None:
+                recorded_tokens.append(token)
+            # only nested references need to recurse, everything else is passed straight through
+            if token.startswith("@") and len(token) > 1:
+                yield from self._expand_response_file(token[1:], active_files, cache)
+            else:
+                yield token
+        # the file has been read in full at this point, so it's safe to cache
+        if recorded_tokens is not None:
+            cache[abs_filename] = tuple(recorded_tokens)
+        active_files.remove(abs_filename)
+
     def parse_args(self, arguments):
         """
         Parse the `arguments` list given the defined `args_schema`
 
+        Any argument of the form `@path` is replaced with the contents of the
+        response file at `path`, split on whitespace. This allows for argument
+        lists that are too long for the command line.
+
         Parameters
         ----------
-        arguments : list of str
+        arguments : iterable of str
             The arguments, most likely from `sys.argv[1:]`, to be parsed
         
         Outputs
         -------
         None - sets properties of `_values` which can be read using `get_value(arg_name)`
         """
-        while len(arguments) > 0:
-            if self._check_argument_is_arg(arguments[0]):
-                arg_name = arguments[0][1]
+        # walk over the arguments with a cursor rather than popping from the list,
+        # so that response files can be expanded lazily as they're reached
+        tokens = self._expand_arguments(arguments)
+        argument = next(tokens, None)
+        while argument is not None:
+            if self._check_argument_is_arg(argument):
+                arg_name = argument[1]
                 # check that the letter matches one of the named arguments in the schema
                 arg_schema = [i for i in self.schema if arg_name==i['name']]
                 if len(arg_schema) == 1:
@@ -169,22 +287,17 @@ class ArgParser:
                     # if the type is bool
                     if arg_schema['type'] == bool:
                         self._values[arg_name] = True
-                        arguments.pop(0)
                     # if the type is int or float
                     elif arg_schema['type'] in [int, float]:
                         # check if there is another element in the arg list before naively trying to use it
-                        if len(arguments) == 1:
+                        arg_value = next(tokens, None)
+                        if arg_value is None:
                             raise Exception(f"Expected a value to follow arg {arg_name}")
                         # check that the next value in arguments is not another arg, but a value
-                        if not self._check_argument_is_arg(arguments[1]):
+                        if not self._check_argument_is_arg(arg_value):
                             try:
                                 # set the value using the next argument
-                                arg_value = arg_schema['type'](arguments[1])
-                                self._values[arg_name] = arg_value
-                                # remove the argument and the value from the so
-                                # that they're not processed again
-                                arguments.pop(0)
-                                arguments.pop(0)
+                                self._values[arg_name] = arg_schema['type'](arg_value)
                             except TypeError as te:
                                 raise TypeError(f"Invalid type for argument '{arg_name}''. Could not convert str value to {str(arg_schema['type'])}.")
                         else:
@@ -192,14 +305,11 @@ class ArgParser:
                     # if the type is str
                     elif arg_schema['type'] == str:
                         # check if there is another element in the arg list before naively trying to use it
-                        if len(arguments) == 1:
+                        arg_value = next(tokens, None)
+                        if arg_value is None:
                             raise Exception(f"Expected a value to follow arg {arg_name}")
                         # set the value using the next argument
-                        self._values[arg_name] = arguments[1]
-                        # remove the argument and the value from the so
-                        # that they're not processed again
-                        arguments.pop(0)
-                        arguments.pop(0)
+                        self._values[arg_name] = arg_value
 
                 elif len(arg_schema) == 0:
                     raise Exception(f"Unknown argument {arg_name}.")
@@ -210,6 +320,8 @@ class ArgParser:
                     )
             else:
                 raise Exception(f"Format incorrect for named argument. Name must be a single letter")
+            # move the cursor on to the next argument
+            argument = next(tokens, None)
         for sub_schema in self.schema:
             if sub_schema['name'] not in self._values.keys():
                 if sub_schema['default'] is None:
@@ -0,0 +1,61 @@
+"""
+Benchmark cases for the args kata, picked up by `python -m bench`
+"""
+import os, tempfile
+
+from args.args import ArgParser, args_schema
+
+def make_arguments(repeats):
+    """
+    Build an argument list which sets every arg in `args_schema`
+    `repeats` times over, the last value winning.
+
+    Parameters
+    ----------
+    repeats : int
+
+    Outputs
+    -------
+    arguments : list of str
+    """
+    arguments = []
+    for i in range(repeats):
+        arguments += ["-l", "-p", str(8000 + i), "-d", f"/tmp/logs/{i}"]
+    return arguments
+
+def make_response_file(repeats):
+    """
+    Write the arguments from `make_arguments` to a temporary response file
+
+    Outputs
+    -------
+    filename : str
+    """
+    fd, filename = tempfile.mkstemp(suffix=".txt", prefix="args_bench_")
+    with os.fdopen(fd, "w") as f:
+        f.write("\n".join(make_arguments(repeats)))
+    return filename
+
+def parse_response_file(filename):
+    """
+    Parse the arguments in the response file `filename`
+
+    Parameters
+    ----------
+    filename : str
+    """
+    ArgParser(args_schema).parse_args([f"@{filename}"])
+
+BENCHMARKS = [
+    {
+        "name": "parse_args_10000",
+        "setup": lambda: make_arguments(10000),
+        "run": lambda arguments: ArgParser(args_schema).parse_args(arguments),
+    },
+    {
+        "name": "parse_args_response_file_10000",
+        "setup": lambda: make_response_file(10000),
+        "run": parse_response_file,
+        "teardown": os.remove,
+    },
+]
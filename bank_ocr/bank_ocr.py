@@ -311,7 +311,63 @@ def get_valid_acc_nos_with_guessed_numbers(account_number):
     # not necessary to force unique values, but better safe than sorry
     return list(set(valid_guesses))
 
-def generate_fixed_file(account_numbers):
+def classify_account_number(account_number):
+    """
+    Given an account number (the 3-lines of 27-characters format),
+    parse it and return the line to write for it in the fixed file, with 
+    indicators for those believed to be erroneous, invalid, or ambiguous
+
+    Parameters
+    ----------
+    account_number : list
+        list of three strings, 
+        with each string 27 characters long
+
+    Outputs
+    -------
+    result : str
+    """
+    # attempt to parse it
+    acc_no = parse_acc_no(account_number)
+    # if it contains only one unknown character then
+    # we want to guess the missing one
+    if acc_no.count("?") == 1:
+        # generate list of valid guesses
+        valid_guesses = get_valid_acc_nos_with_guessed_numbers(account_number)
+        # if we only got one valid guess, then that's the correct account number
+        if len(valid_guesses) == 1:
+            return f"{valid_guesses[0]}"
+        # but if there are no valid guesses then we use the 
+        # parsed one and call it ILL
+        elif len(valid_guesses) == 0:
+            return f"{acc_no} ILL"
+        # if there are more than 1 valid guesses then
+        # we call it AMB and list the guesses after the parsed one
+        else:
+            return f"{acc_no} AMB {valid_guesses}"
+    # if there are more than 1 "?" then we won't guess, call it ILL
+    elif acc_no.count("?") > 1:
+        return f"{acc_no} ILL"
+    # if there are no "?"s in the parsed account number
+    else:
+        # if it's valid, then that's the result
+        if is_valid_acc_no(acc_no):
+            return f"{acc_no}"
+        # otherwise, try to guess valid ones by changing one number to
+        # a number that's within an error's reach of it
+        else:
+            valid_guesses = get_valid_acc_nos_with_guessed_numbers(account_number)
+            # as above, if 1 match, that's the right one
+            # if no matches, it's ERR
+            # if more than 1, it's AMB and list the possible values
+            if len(valid_guesses) == 1:
+                return f"{valid_guesses[0]}"
+            elif len(valid_guesses) == 0:
+                return f"{acc_no} ERR"
+            else:
+                return f"{acc_no} AMB {valid_guesses}"
+
+def generate_fixed_file(account_numbers, output_filename="outputs.txt"):
     """
     Given a list of account numbers (the 3-lines of 27-characters format),
     output a file containing each account number parsed, with indicators for those
@@ -320,64 +376,39 @@ def generate_fixed_file(account_numbers):
     Args:
     account_number: list of three strings, 
     with each string 27 characters long
+    output_filename: path of the file to write the results to
     """
     # open a file to write the results to
-    with open("outputs.txt", "w") as f:
+    with open(output_filename, "w") as f:
         # iterate over each account_number
         for account_number in account_numbers:
-            # attempt to parse it
-            acc_no = parse_acc_no(account_number)
-            # if it contains only one unknown character then
-            # we want to guess the missing one
-            if acc_no.count("?") == 1:
-                # generate list of valid guesses
-                valid_guesses = get_valid_acc_nos_with_guessed_numbers(account_number)
-                # if we only got one valid guess, then that's the correct account number
-                # and we should write it to the file
-                if len(valid_guesses) == 1:
-                    f.write(f"{valid_guesses[0]}\n")
-                # but if there are no valid guesses then we write the 
-                # parsed one and call it ILL
-                elif len(valid_guesses) == 0:
-                    f.write(f"{acc_no} ILL\n")
-                # if there are more than 1 valid guesses then
-                # we call it AMB and list the guesses after the parsed one
-                else:
-                    f.write(f"{acc_no} AMB {valid_guesses}\n")
-            # if there are more than 1 "?" then we won't guess, call it ILL
-            elif acc_no.count("?") > 1:
-                f.write(f"{acc_no} ILL\n")
-            # if there are no "?"s in the parsed account number
-            else:
-                # if it's valid, then write that to the file
-                if is_valid_acc_no(acc_no):
-                    f.write(f"{acc_no}\n")
-                # otherwise, try to guess valid ones by changing one number to
-                # a number that's within an error's reach of it
-                else:
-                    valid_guesses = get_valid_acc_nos_with_guessed_numbers(account_number)
-                    # as above, if 1 match, that's the right one
-                    # if no matches, it's ERR
-                    # if more than 1, it's AMB and list the possible values
-                    if len(valid_guesses) == 1:
-                        f.write(f"{valid_guesses[0]}\n")
-                    elif len(valid_guesses) == 0:
-                        f.write(f"{acc_no} ERR\n")
-                    else:
-                        f.write(f"{acc_no} AMB {valid_guesses}\n")
+            f.write(f"{classify_account_number(account_number)}\n")
 
 def parse_input_file(filename):
     """
     parse the input file of account numbers and return them as an array of strings
     """
+    return list(iter_input_file(filename))
+
+def iter_input_file(filename):
+    """
+    lazily parse the input file of account numbers, yielding them one at a time
+    as lists of three strings, so the whole file never has to be held in memory.
+    Entries that are entirely blank, such as from blank lines at the end of the
+    file, are skipped, whereas an incomplete entry is yielded as it is.
+    """
     with open(filename, "r") as f:
-        file_lines = f.read().split("\n")
-    account_numbers = []
-    for i in range(0, len(file_lines), 4):
-        account_numbers.append(
-            file_lines[i:i+3]
-        )
-    return account_numbers
+        account_number = []
+        for line in f:
+            account_number.append(line.rstrip("\n"))
+            # every account number is three lines followed by a blank one
+            if len(account_number) == 3:
+                if any(i.strip() != "" for i in account_number):
+                    yield account_number
+                account_number = []
+                next(f, None)
+        if any(i.strip() != "" for i in account_number):
+            yield account_number
 
 if __name__ == "__main__":
     account_numbers = parse_input_file("account_numbers.txt")
@@ -0,0 +1,40 @@
+"""
+Benchmark cases for the bank OCR kata, picked up by `python -m bench`
+"""
+import os
+
+from bank_ocr.bank_ocr import (
+    parse_acc_no,
+    get_valid_acc_nos_with_guessed_numbers,
+    parse_input_file,
+)
+
+ACCOUNT_NUMBERS_FILE = os.path.join(os.path.dirname(__file__), "account_numbers.txt")
+
+def load_account_numbers(times):
+    """
+    Load the account numbers from account_numbers.txt, repeated `times` over
+
+    Outputs
+    -------
+    account_numbers : list of lists of str
+    """
+    return parse_input_file(ACCOUNT_NUMBERS_FILE) * times
+
+BENCHMARKS = [
+    {
+        "name": "parse_input_file",
+        "setup": lambda: ACCOUNT_NUMBERS_FILE,
+        "run": parse_input_file,
+    },
+    {
+        "name": "parse_acc_no",
+        "setup": lambda: load_account_numbers(20),
+        "run": lambda account_numbers: [parse_acc_no(i) for i in account_numbers],
+    },
+    {
+        "name": "get_valid_acc_nos_with_guessed_numbers",
+        "setup": lambda: load_account_numbers(2),
+        "run": lambda account_numbers: [get_valid_acc_nos_with_guessed_numbers(i) for i in account_numbers],
+    },
+]
@@ -0,0 +1,317 @@
+"""
+Shared benchmark runner for all of the kata in this repo.
+
+Each kata package can define a `bench_cases` module containing a `BENCHMARKS`
+list, where each benchmark is a dict of the form:
+
+```python
+{
+    "name": "my_benchmark",          # unique within the package
+    "setup": lambda: my_input,       # called before every run, not timed
+    "run": lambda my_input: ...,     # the code being timed
+    "teardown": lambda my_input: ..., # optional, called after every run, not timed
+}
+```
+
+Timings and memory peaks are appended to a JSON history file, and compared
+against a stored baseline so that slowdowns can be flagged.
+"""
+import importlib, json, math, os, platform, statistics, time, tracemalloc
+from datetime import datetime, timezone
+
+from args.args import ArgParser
+
+KATA_PACKAGES = ("anagram", "args", "bank_ocr")
+
+BENCH_ARGS_SCHEMA = [
+    {
+        "name": "w",
+        "type": int,
+        "description": "Integer: number of untimed warmup runs per benchmark",
+        "default": 1
+    },
+    {
+        "name": "r",
+        "type": int,
+        "description": "Integer: number of timed runs per benchmark",
+        "default": 10
+    },
+    {
+        "name": "k",
+        "type": str,
+        "description": "String: only run benchmarks whose full name contains this",
+        "default": ""
+    },
+    {
+        "name": "f",
+        "type": str,
+        "description": "String: path to the JSON history file",
+        "default": "bench_history.json"
+    },
+    {
+        "name": "b",
+        "type": bool,
+        "description": "Boolean: flag to store this run as the new baseline",
+        "default": False
+    },
+    {
+        "name": "a",
+        "type": float,
+        "description": "Float: significance level for flagging a slowdown",
+        "default": 0.05
+    },
+    {
+        "name": "t",
+        "type": float,
+        "description": "Float: minimum relative slowdown of the median to flag, e.g. 0.05 for 5%",
+        "default": 0.05
+    }
+]
+
+def discover_benchmarks(packages=KATA_PACKAGES):
+    """
+    Find the benchmarks defined in the `bench_cases` module of each package
+
+    Parameters
+    ----------
+    packages : iterable of str
+        names of the packages to look in
+
+    Outputs
+    -------
+    benchmarks : dict
+        full benchmark name ("package.name") -> benchmark dict
+    """
+    benchmarks = {}
+    for package in packages:
+        try:
+            module = importlib.import_module(f"{package}.bench_cases")
+        except ModuleNotFoundError as e:
+            # packages without any benchmarks are fine, but a bench_cases
+            # module failing on one of its own imports is not
+            if e.name != f"{package}.bench_cases":
+                raise
+            continue
+        for benchmark in module.BENCHMARKS:
+            full_name = f"{package}.{benchmark['name']}"
+            if full_name in benchmarks:
+                raise KeyError(f"A benchmark with the name {full_name} already exists!")
+            benchmarks[full_name] = benchmark
+    return benchmarks
+
+def run_benchmark(benchmark, warmup, repeats):
+    """
+    Time `benchmark` over `repeats` runs after `warmup` untimed runs,
+    then do one more run under tracemalloc to get its memory peak.
+    Memory is measured separately as tracing slows everything down.
+    The benchmark's teardown, if it has one, is called after every run.
+
+    Parameters
+    ----------
+    benchmark : dict
+    warmup : int
+    repeats : int
+
+    Outputs
+    -------
+    result : dict
+        the timings of every run in seconds along with summary statistics,
+        and the peak memory allocated in bytes
+    """
+    if repeats < 1:
+        raise ValueError(f"Need at least one timed run but got {repeats}")
+    teardown = benchmark.get("teardown", lambda data: None)
+    for _ in range(warmup):
+        data = benchmark["setup"]()
+        try:
+            benchmark["run"](data)
+        finally:
+            teardown(data)
+    times = []
+    for _ in range(repeats):
+        data = benchmark["setup"]()
+        try:
+            start = time.perf_counter()
+            benchmark["run"](data)
+            times.append(time.perf_counter() - start)
+        finally:
+            teardown(data)
+    data = benchmark["setup"]()
+    tracemalloc.start()
+    try:
+        benchmark["run"](data)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        teardown(data)
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "peak_memory": peak_memory,
+    }
+
+def mann_whitney_p_value(baseline_times, current_times):
+    """
+    One-sided Mann-Whitney U test, using the normal approximation,
+    for whether `current_times` tend to be larger than `baseline_times`.
+    Makes no assumption about the timings being normally distributed.
+
+    Parameters
+    ----------
+    baseline_times : list of float
+    current_times : list of float
+
+    Outputs
+    -------
+    p_value : float
+    """
+    n1, n2 = len(current_times), len(baseline_times)
+    # rank all of the timings together, averaging the ranks of any ties
+    combined = sorted([(t, 0) for t in current_times] + [(t, 1) for t in baseline_times])
+    ranks = [0.0] * len(combined)
+    tie_correction = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_correction += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    rank_sum = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # continuity correction, then the upper tail of the standard normal
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare_to_baseline(results, baseline, alpha, threshold):
+    """
+    Flag every benchmark in `results` that is significantly slower than in `baseline`
+
+    Parameters
+    ----------
+    results : dict
+        benchmark name -> result dict from `run_benchmark`
+    baseline : dict
+        as `results`, from previous runs
+    alpha : float
+        significance level for the Mann-Whitney U test
+    threshold : float
+        minimum relative slowdown of the median to be worth flagging
+
+    Outputs
+    -------
+    regressions : dict
+        benchmark name -> dict of the relative slowdown and p value
+    """
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        # a relative slowdown against nothing doesn't mean anything
+        if baseline[name]["median"] <= 0:
+            continue
+        slowdown = result["median"] / baseline[name]["median"] - 1
+        p_value = mann_whitney_p_value(baseline[name]["times"], result["times"])
+        if p_value < alpha and slowdown > threshold:
+            regressions[name] = {"slowdown": slowdown, "p_value": p_value}
+    return regressions
+
+def load_history(filename):
+    """
+    Load the JSON history file, or start a new one if it doesn't exist yet
+    """
+    if not os.path.exists(filename):
+        return {"baseline": {"results": {}}, "runs": []}
+    with open(filename, "r") as f:
+        return json.load(f)
+
+def save_history(filename, history):
+    # write to a temporary file first so a failed write can't corrupt the history
+    with open(filename + ".tmp", "w") as f:
+        json.dump(history, f, indent=2)
+    os.replace(filename + ".tmp", filename)
+
+def main(arguments):
+    """
+    Run the benchmarks, record them in the history file and report any regressions
+
+    Parameters
+    ----------
+    arguments : list of str
+        command line arguments as described in BENCH_ARGS_SCHEMA
+
+    Outputs
+    -------
+    exit_code : int
+        1 if any regressions were found, otherwise 0
+    """
+    arg_parser = ArgParser(BENCH_ARGS_SCHEMA)
+    arg_parser.parse_args(arguments)
+    name_filter = arg_parser.get_arg_value("k")
+    history_file = arg_parser.get_arg_value("f")
+
+    benchmarks = discover_benchmarks()
+    results = {}
+    for name, benchmark in benchmarks.items():
+        if name_filter not in name:
+            continue
+        result = run_benchmark(
+            benchmark,
+            arg_parser.get_arg_value("w"),
+            arg_parser.get_arg_value("r")
+        )
+        results[name] = result
+        print(
+            f"{name:<55} median {result['median'] * 1000:10.3f} ms "
+            f"(stdev {result['stdev'] * 1000:.3f} ms) "
+            f"peak {result['peak_memory'] / 1024:10.1f} KiB"
+        )
+
+    history = load_history(history_file)
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    history["runs"].append(run)
+
+    # the baseline is kept per benchmark, so that running a subset of
+    # the benchmarks never loses the baseline of the others
+    baseline = history["baseline"]["results"]
+    if arg_parser.get_arg_value("b"):
+        compared = {}
+        new_baselines = results
+    else:
+        compared = {k: v for k, v in results.items() if k in baseline}
+        new_baselines = {k: v for k, v in results.items() if k not in baseline}
+    for name, result in new_baselines.items():
+        baseline[name] = dict(result, timestamp=run["timestamp"])
+        print(f"Stored this run as the baseline for {name} in {history_file}")
+
+    regressions = compare_to_baseline(
+        compared,
+        baseline,
+        arg_parser.get_arg_value("a"),
+        arg_parser.get_arg_value("t")
+    )
+    for name, regression in regressions.items():
+        print(
+            f"REGRESSION {name}: median {regression['slowdown']:+.1%} "
+            f"against baseline from {baseline[name]['timestamp']} "
+            f"(p={regression['p_value']:.4f})"
+        )
+    if len(compared) > 0 and len(regressions) == 0:
+        print(f"No significant slowdowns in {len(compared)} benchmarks compared against their baselines")
+    run["regressions"] = regressions
+    save_history(history_file, history)
+    return 1 if len(regressions) > 0 else 0
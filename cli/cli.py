@@ -0,0 +1,300 @@
+"""
+Single command line front end for the kata, e.g.
+
+```
+python -m cli bank_ocr -i bank_ocr/account_numbers.txt -o outputs.txt -w 4 -s
+python -m cli anagram -i wordlist.txt -x documenting
+```
+
+Each subcommand parses the rest of the arguments with its own `ArgParser` schema,
+so `@path` response files work here too.
+"""
+import collections, itertools, multiprocessing, sys, threading
+
+from args.args import ArgParser
+from anagram import anagram
+from bank_ocr import bank_ocr
+from profiling import profiling
+
+# args that control how a kata is run, shared by every subcommand
+RUN_ARGS_SCHEMA = [
+    {
+        "name": "w",
+        "type": int,
+        "description": "Integer: number of worker processes to use",
+        "default": 1
+    },
+    {
+        "name": "c",
+        "type": int,
+        "description": "Integer: number of items handed to a worker at a time",
+        "default": 64
+    },
+    {
+        "name": "s",
+        "type": bool,
+        "description": "Boolean: flag to stream the input and output rather than holding them in memory",
+        "default": False
+    },
+    {
+        "name": "p",
+        "type": bool,
+        "description": f"Boolean: flag to profile the hot functions and write a report to {profiling.DEFAULT_OUTPUT_DIR}/",
+        "default": False
+    }
+]
+
+BANK_OCR_ARGS_SCHEMA = [
+    {
+        "name": "i",
+        "type": str,
+        "description": "String: path to the file of account numbers to read",
+        "default": None
+    },
+    {
+        "name": "o",
+        "type": str,
+        "description": "String: path to write the parsed account numbers to",
+        "default": "outputs.txt"
+    }
+] + RUN_ARGS_SCHEMA
+
+ANAGRAM_ARGS_SCHEMA = [
+    {
+        "name": "i",
+        "type": str,
+        "description": "String: path to the word list file to read",
+        "default": None
+    },
+    {
+        "name": "o",
+        "type": str,
+        "description": "String: path to write the word pairs to, or stdout if not given",
+        "default": ""
+    },
+    {
+        "name": "x",
+        "type": str,
+        "description": "String: the source word to build two-word anagrams from",
+        "default": "documenting"
+    }
+] + RUN_ARGS_SCHEMA
+
+def _apply_to_chunk(func, chunk):
+    return [func(i) for i in chunk]
+
+def _map(func, iterable, workers, chunk_size, stream=False, initializer=None, initargs=()):
+    """
+    Lazily map `func` over `iterable`, in order, across `workers` processes.
+    With a single worker everything happens in this process.
+
+    When streaming, chunks of `chunk_size` items are handed out to the workers
+    as earlier chunks finish, with at most `2 * workers` chunks being worked on
+    and at most `8 * workers` chunks whose results haven't been used yet, so no
+    more than `8 * workers * chunk_size` items are read ahead of the results.
+
+    Parameters
+    ----------
+    func : callable
+        must be a module-level function so that it can be sent to the workers
+    iterable : iterable
+    workers : int
+    chunk_size : int
+        number of items from `iterable` to hand to a worker at a time
+    stream : bool
+        whether to limit how far ahead of the results `iterable` is read
+    initializer : callable
+        called with `initargs` in each worker (or once here) before mapping
+
+    Outputs
+    -------
+    results : generator
+    """
+    if workers < 1 or chunk_size < 1:
+        raise ValueError(f"Worker count and chunk size must be at least 1 but got {workers} and {chunk_size}")
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(func, iterable)
+    elif not stream:
+        with multiprocessing.Pool(workers, initializer, initargs) as pool:
+            yield from pool.imap(func, iterable, chunk_size)
+    else:
+        with multiprocessing.Pool(workers, initializer, initargs) as pool:
+            yield from _map_streaming(pool, func, iterable, workers, chunk_size)
+
+def _map_streaming(pool, func, iterable, workers, chunk_size):
+    """
+    The streaming part of `_map`. Pool.imap would read all of `iterable` into
+    its task queue up front, so chunks are submitted one at a time instead.
+    A slow chunk at the front only holds up the results, not the workers, as
+    new chunks are submitted whenever any chunk finishes.
+    """
+    max_unfinished = 2 * workers
+    max_pending = 8 * workers
+    items = iter(iterable)
+    chunks = iter(lambda: list(itertools.islice(items, chunk_size)), [])
+    # results in the order they were submitted, finished or not
+    pending = collections.deque()
+    # the number of pending chunks still being worked on, which is
+    # counted down by the pool as each of them finishes
+    unfinished = [0]
+    finished = threading.Condition()
+    def on_finished(_):
+        with finished:
+            unfinished[0] -= 1
+            finished.notify()
+    exhausted = False
+    while True:
+        # keep the workers busy
+        while not exhausted and unfinished[0] < max_unfinished and len(pending) < max_pending:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                break
+            with finished:
+                unfinished[0] += 1
+            pending.append(pool.apply_async(
+                _apply_to_chunk, (func, chunk), callback=on_finished, error_callback=on_finished
+            ))
+        if len(pending) == 0:
+            break
+        if pending[0].ready() or exhausted or len(pending) >= max_pending:
+            # nothing more can be submitted, so wait for the oldest chunk
+            yield from pending.popleft().get()
+        else:
+            # the workers are all busy, so wait for any chunk to finish
+            # before submitting the next one
+            with finished:
+                finished.wait_for(lambda: unfinished[0] < max_unfinished)
+
+def run_bank_ocr(arg_parser, workers):
+    """
+    Parse the account numbers in the input file and write them out with their status
+    """
+    input_filename = arg_parser.get_arg_value("i")
+    if arg_parser.get_arg_value("s"):
+        account_numbers = bank_ocr.iter_input_file(input_filename)
+    else:
+        account_numbers = bank_ocr.parse_input_file(input_filename)
+    lines = _map(
+        bank_ocr.classify_account_number,
+        account_numbers,
+        workers,
+        arg_parser.get_arg_value("c"),
+        arg_parser.get_arg_value("s")
+    )
+    if not arg_parser.get_arg_value("s"):
+        lines = list(lines)
+    with open(arg_parser.get_arg_value("o"), "w") as f:
+        for line in lines:
+            f.write(f"{line}\n")
+
+# the word list and source word for each anagram worker,
+# set once per worker rather than sent along with every word
+_anagram_word_list = None
+_anagram_source_word = None
+
+def _init_anagram_worker(source_word, word_list):
+    global _anagram_word_list, _anagram_source_word
+    _anagram_source_word = source_word
+    _anagram_word_list = word_list
+
+def _anagram_worker(word1):
+    return anagram.find_pairs_for_word(_anagram_source_word, word1, _anagram_word_list)
+
+def run_anagram(arg_parser, workers):
+    """
+    Find the two-word anagrams of the source word and write them out, one pair per line
+    """
+    source_word = arg_parser.get_arg_value("x")
+    # every word is checked against every other word, so
+    # the word list is always held in memory
+    word_list = anagram.parse_wordlist_file(arg_parser.get_arg_value("i"))
+    pair_lists = _map(
+        _anagram_worker,
+        word_list,
+        workers,
+        arg_parser.get_arg_value("c"),
+        arg_parser.get_arg_value("s"),
+        _init_anagram_worker,
+        (source_word, word_list)
+    )
+    output_filename = arg_parser.get_arg_value("o")
+    f = open(output_filename, "w") if output_filename != "" else sys.stdout
+    try:
+        if arg_parser.get_arg_value("s"):
+            # write each unique pair as soon as it's found
+            seen = set()
+            for word_pairs in pair_lists:
+                for pair in word_pairs:
+                    pair = tuple(sorted(pair))
+                    if pair not in seen:
+                        seen.add(pair)
+                        f.write(f"{pair[0]} {pair[1]}\n")
+        else:
+            word_pairs = set(tuple(sorted(pair)) for word_pairs in pair_lists for pair in word_pairs)
+            for pair in word_pairs:
+                f.write(f"{pair[0]} {pair[1]}\n")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+SUBCOMMANDS = {
+    "bank_ocr": (BANK_OCR_ARGS_SCHEMA, run_bank_ocr),
+    "anagram": (ANAGRAM_ARGS_SCHEMA, run_anagram),
+}
+
+def usage():
+    """
+    Build the usage message listing every subcommand and its args
+    """
+    lines = ["Usage: python -m cli <subcommand> [args]", ""]
+    for name, (schema, _) in SUBCOMMANDS.items():
+        lines.append(f"{name}:")
+        arg_parser = ArgParser(schema)
+        for sub_schema in schema:
+            lines.append(f"  -{sub_schema['name']}  {arg_parser.help(sub_schema['name'])}")
+    return "\n".join(lines)
+
+def main(arguments):
+    """
+    Dispatch `arguments` to the subcommand named by the first of them
+
+    Parameters
+    ----------
+    arguments : list of str
+        most likely `sys.argv[1:]`
+
+    Outputs
+    -------
+    exit_code : int
+    """
+    if len(arguments) == 0 or arguments[0] not in SUBCOMMANDS:
+        print(usage(), file=sys.stderr)
+        return 2
+    schema, run = SUBCOMMANDS[arguments[0]]
+    arg_parser = ArgParser(schema)
+    arg_parser.parse_args(arguments[1:])
+    workers = arg_parser.get_arg_value("w")
+    profile = arg_parser.get_arg_value("p")
+    # only this process is profiled, whether by -p or KATA_PROFILE,
+    # so keep all of the work in it
+    if (profile or profiling.is_enabled()) and workers > 1:
+        print("Profiling only records this process, so running with 1 worker", file=sys.stderr)
+        workers = 1
+    if profile:
+        profiling.enable(**profiling.options_from_environment())
+        try:
+            # parse the arguments again now that profiling is on,
+            # so that ArgParser.parse_args is part of the profile too
+            arg_parser = ArgParser(schema)
+            arg_parser.parse_args(arguments[1:])
+            run(arg_parser, workers)
+        finally:
+            profiling.disable()
+            output_dir = profiling.write_report()
+        print(f"Wrote profile to {output_dir}/", file=sys.stderr)
+    else:
+        run(arg_parser, workers)
+    return 0
@@ -0,0 +1,2 @@
+# Lets a plain `pytest` run from the root of the repo import the kata packages,
+# as pytest puts the directory of a root-level conftest.py on sys.path
@@ -0,0 +1,346 @@
+"""
+Opt-in profiling of the hot paths of the kata.
+
+Nothing is touched until profiling is enabled, either by calling `enable()` or
+by setting the `KATA_PROFILE` environment variable to an output directory before
+this module is imported, which `python -m cli` does. Enabling it swaps each
+function in HOT_FUNCTIONS for a wrapper that records call counts, cumulative
+time and allocation peaks, and disabling it puts the originals back, so it
+costs nothing when it's turned off.
+
+Usage
+-----
+```python
+>>>from profiling import profiling
+>>>profiling.enable("kata_profile")
+>>>bank_ocr.generate_fixed_file(account_numbers)
+>>>profiling.write_report()
+>>>profiling.disable()
+```
+
+Calls are only seen through module attributes, so names imported with
+`from module import function` before enabling won't be profiled. Only the
+current process is recorded, so worker processes are not included. Time spent
+in the profiling itself is left out of the report, but still slows the run down.
+Tracing allocations slows down everything that allocates, so timings are only
+approximate when memory is being profiled.
+"""
+import atexit, cProfile, functools, importlib, os, statistics, threading, time, tracemalloc, warnings
+
+# (module, attribute path) of each function to profile
+HOT_FUNCTIONS = (
+    ("anagram.anagram", "anagram_kata"),
+    ("anagram.anagram", "find_pairs_for_word"),
+    ("anagram.anagram", "word_in_parent"),
+    ("bank_ocr.bank_ocr", "parse_acc_no"),
+    ("bank_ocr.bank_ocr", "get_valid_acc_nos_with_guessed_numbers"),
+    ("args.args", "ArgParser.parse_args"),
+)
+
+DEFAULT_OUTPUT_DIR = "kata_profile"
+
+# everything recorded while profiling is enabled
+_state = {
+    "enabled": False,
+    "output_dir": DEFAULT_OUTPUT_DIR,
+    "memory": False,
+    # whether tracemalloc was started here, and so should be stopped here
+    "started_tracemalloc": False,
+    "profiler": None,
+    # seconds of profiling overhead per call that the wrapper can't time itself
+    "bias": 0.0,
+    "originals": [],
+    "stats": {},
+    "stacks": {},
+}
+_lock = threading.Lock()
+_local = threading.local()
+
+def _call_stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+def _wrap(name, func):
+    """
+    Wrap `func` so that each call is recorded against `name`.
+
+    The time spent in the wrapper's own bookkeeping is taken off both the
+    self time and the cumulative time of every caller, so profiling a
+    function doesn't make the function calling it look slower. What can't be
+    timed from inside the wrapper, such as calling it, is estimated by `_calibrate`.
+
+    Parameters
+    ----------
+    name : str
+        full name of the function, used in the report
+    func : callable
+
+    Outputs
+    -------
+    wrapper : callable
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # the whole span of the wrapper, bookkeeping included
+        span_start = time.perf_counter()
+        stack = _call_stack()
+        if len(stack) > 0:
+            parent = stack[-1]
+            path = f"{parent['path']};{name}"
+            recursive = name in parent["names"]
+            names = parent["names"] | {name}
+        else:
+            parent = None
+            path = name
+            recursive = False
+            names = frozenset((name,))
+        frame = {
+            "path": path,
+            "names": names,
+            # time spent in profiled functions called from this one
+            "child_time": 0.0,
+            # time spent in the profiling of those functions
+            "overhead": 0.0,
+            "peak": 0,
+            "start_memory": 0,
+        }
+        if _state["memory"]:
+            current, peak = tracemalloc.get_traced_memory()
+            # the caller's peak so far has to be kept before resetting it for this call
+            if parent is not None:
+                parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["start_memory"] = current
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            allocation_peak = 0
+            if _state["memory"]:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                allocation_peak = peak - frame["start_memory"]
+                # hand this call's peak up to the caller, and start counting afresh
+                if parent is not None:
+                    parent["peak"] = max(parent["peak"], peak)
+                tracemalloc.reset_peak()
+            with _lock:
+                stats = _state["stats"].setdefault(
+                    name, {"calls": 0, "cumulative_time": 0.0, "peak_memory": 0}
+                )
+                stats["calls"] += 1
+                # don't count the time of recursive calls twice
+                if not recursive:
+                    stats["cumulative_time"] += elapsed - frame["overhead"]
+                stats["peak_memory"] = max(stats["peak_memory"], allocation_peak)
+                _state["stacks"][path] = (
+                    _state["stacks"].get(path, 0.0) + elapsed - frame["child_time"]
+                )
+            if parent is not None:
+                overhead = frame["overhead"]
+                # free this call's bookkeeping now, so that it's counted in the span
+                frame = names = None
+                # everything outside of `elapsed` was spent profiling,
+                # so none of it belongs to the caller
+                span = time.perf_counter() - span_start
+                parent["child_time"] += span + _state["bias"]
+                parent["overhead"] += span - elapsed + overhead + _state["bias"]
+    return wrapper
+
+def _calibrate(calls=2000, rounds=5):
+    """
+    Estimate the overhead of each profiled call that the wrapper can't time
+    itself, by timing calls to a profiled function that does nothing, in the
+    same way as the bias of the standard library's `profile` module.
+    Tracing allocations makes the overhead a lot bigger, so this has to be
+    run with tracemalloc in the same state as when profiling.
+
+    Parameters
+    ----------
+    calls : int
+        number of calls to average the overhead over
+    rounds : int
+        number of times to do so, taking the median
+
+    Outputs
+    -------
+    bias : float
+        seconds of overhead per call
+    """
+    # take arguments like the real hot functions, as packing them has a cost too
+    def nothing(a, b):
+        pass
+    profiled_nothing = _wrap("nothing", nothing)
+    def caller():
+        total = 0.0
+        for _ in range(calls):
+            start = time.perf_counter()
+            profiled_nothing(1, 2)
+            total += time.perf_counter() - start
+        # subtract what calling the unprofiled function costs anyway
+        start = time.perf_counter()
+        for _ in range(calls):
+            nothing(1, 2)
+        unprofiled = time.perf_counter() - start
+        return total - unprofiled - _call_stack()[-1]["child_time"]
+    _state["bias"] = 0.0
+    # the first rounds are slowed down by warming up, so take the median of a few
+    bias = max(statistics.median(_wrap("caller", caller)() / calls for _ in range(rounds)), 0.0)
+    # the calibration calls aren't part of the profile
+    _state["stats"] = {}
+    _state["stacks"] = {}
+    return bias
+
+def enable(output_dir=DEFAULT_OUTPUT_DIR, memory=True, cprofile=False):
+    """
+    Start profiling the functions in HOT_FUNCTIONS
+
+    Allocation peaks are measured by resetting the tracemalloc peak on every
+    call, which would break the peak of anything else already using tracemalloc.
+    So if tracemalloc is already tracing, allocation peaks aren't recorded.
+
+    Parameters
+    ----------
+    output_dir : str
+        directory that `write_report` writes to
+    memory : bool
+        whether to trace allocation peaks with tracemalloc, which is slow
+    cprofile : bool
+        whether to also run cProfile over everything, saved as profile.pstats
+    """
+    if _state["enabled"]:
+        return
+    _state["enabled"] = True
+    _state["output_dir"] = output_dir
+    _state["stats"] = {}
+    _state["stacks"] = {}
+    if memory and tracemalloc.is_tracing():
+        warnings.warn("tracemalloc is already tracing, so allocation peaks won't be profiled")
+        memory = False
+    _state["memory"] = memory
+    for module_name, attribute_path in HOT_FUNCTIONS:
+        # walk down to whatever holds the function, e.g. a class
+        owner = importlib.import_module(module_name)
+        *owner_path, attribute = attribute_path.split(".")
+        for i in owner_path:
+            owner = getattr(owner, i)
+        original = getattr(owner, attribute)
+        _state["originals"].append((owner, attribute, original))
+        setattr(owner, attribute, _wrap(f"{module_name}.{attribute_path}", original))
+    if memory:
+        tracemalloc.start()
+        _state["started_tracemalloc"] = True
+    _state["bias"] = _calibrate()
+    _state["profiler"] = None
+    if cprofile:
+        _state["profiler"] = cProfile.Profile()
+        _state["profiler"].enable()
+
+def disable():
+    """
+    Stop profiling and put the original functions back.
+    Anything recorded is kept until profiling is enabled again.
+    """
+    if not _state["enabled"]:
+        return
+    if _state["profiler"] is not None:
+        _state["profiler"].disable()
+    _state["memory"] = False
+    if _state["started_tracemalloc"]:
+        tracemalloc.stop()
+        _state["started_tracemalloc"] = False
+    for owner, attribute, original in reversed(_state["originals"]):
+        setattr(owner, attribute, original)
+    _state["originals"] = []
+    _state["enabled"] = False
+
+def is_enabled():
+    """
+    Outputs
+    -------
+    result : bool
+        True if profiling is currently enabled
+    """
+    return _state["enabled"]
+
+def options_from_environment():
+    """
+    Read the options for `enable` from the environment, so that
+    `KATA_PROFILE_MEMORY=0` turns off tracing allocations and
+    `KATA_PROFILE_CPROFILE=1` turns on cProfile
+
+    Outputs
+    -------
+    options : dict
+        keyword arguments for `enable`
+    """
+    return {
+        "memory": os.environ.get("KATA_PROFILE_MEMORY", "1") != "0",
+        "cprofile": os.environ.get("KATA_PROFILE_CPROFILE", "0") != "0",
+    }
+
+def get_stats():
+    """
+    Outputs
+    -------
+    stats : dict
+        function name -> dict of "calls", "cumulative_time" in seconds
+        and "peak_memory" allocated during a single call in bytes
+    """
+    with _lock:
+        return {k: dict(v) for k, v in _state["stats"].items()}
+
+def write_report(output_dir=None):
+    """
+    Write what has been recorded so far to `output_dir`:
+    - collapsed_stacks.txt, with self time in microseconds, for flamegraph.pl or speedscope
+    - summary.txt, a table of the stats of each function
+    - profile.pstats, if cProfile was enabled
+
+    Parameters
+    ----------
+    output_dir : str
+        defaults to the directory given to `enable`
+
+    Outputs
+    -------
+    output_dir : str
+    """
+    if output_dir is None:
+        output_dir = _state["output_dir"]
+    os.makedirs(output_dir, exist_ok=True)
+    with _lock:
+        stacks = dict(_state["stacks"])
+    with open(os.path.join(output_dir, "collapsed_stacks.txt"), "w") as f:
+        for collapsed_stack, self_time in sorted(stacks.items()):
+            microseconds = round(self_time * 1e6)
+            # flamegraph.pl expects whole numbers, so drop anything that rounds to nothing
+            if microseconds > 0:
+                f.write(f"{collapsed_stack} {microseconds}\n")
+    stats = get_stats()
+    with open(os.path.join(output_dir, "summary.txt"), "w") as f:
+        f.write(f"{'function':<60} {'calls':>10} {'cumulative s':>14} {'per call ms':>12} {'peak KiB':>10}\n")
+        for name, stat in sorted(stats.items(), key=lambda i: -i[1]["cumulative_time"]):
+            # taking off the estimated overhead can leave a function that
+            # does next to nothing just under zero
+            cumulative_time = max(stat["cumulative_time"], 0.0)
+            f.write(
+                f"{name:<60} {stat['calls']:>10} {cumulative_time:>14.6f} "
+                f"{cumulative_time / stat['calls'] * 1000:>12.6f} "
+                f"{stat['peak_memory'] / 1024:>10.1f}\n"
+            )
+    if _state["profiler"] is not None:
+        _state["profiler"].dump_stats(os.path.join(output_dir, "profile.pstats"))
+    return output_dir
+
+def _write_report_at_exit():
+    disable()
+    write_report()
+
+# allow profiling a whole run without changing any code
+if os.environ.get("KATA_PROFILE"):
+    enable(os.environ["KATA_PROFILE"], **options_from_environment())
+    atexit.register(_write_report_at_exit)
@@ -0,0 +1,45 @@
+from anagram.anagram import anagram_kata, find_pairs_for_word, iter_wordlist_file, parse_wordlist_file
+from anagram.bench_cases import SOURCE_WORD, make_word_list
+
+def write_wordlist(path, words):
+    """
+    Write `words` in the format of wordlist.txt: a header line, then lines
+    of up to six 9-character columns, indented by two characters
+    """
+    with open(path, "w") as f:
+        f.write("header\n")
+        for i in range(0, len(words), 6):
+            f.write("  " + "".join(word.ljust(9) for word in words[i:i+6]) + "\n")
+    return str(path)
+
+def original_anagram_kata(source_word, word_list):
+    """
+    anagram_kata as it was before the loop over the second word
+    was moved out into find_pairs_for_word
+    """
+    from anagram.anagram import word_in_parent
+    word_pairs = []
+    for word1 in word_list:
+        result1, temp_source_word = word_in_parent(source_word, word1)
+        if result1:
+            for word2 in word_list:
+                result2, temp_source_word = word_in_parent(temp_source_word, word2)
+                if result2:
+                    word_pairs.append((word1, word2))
+    return sorted(set(tuple(sorted(i)) for i in word_pairs))
+
+def test_anagram_kata_matches_original():
+    words = make_word_list(200)
+    assert sorted(anagram_kata(SOURCE_WORD, words)) == original_anagram_kata(SOURCE_WORD, words)
+
+def test_find_pairs_for_word():
+    assert find_pairs_for_word("documenting", "document", ["in", "go", "xyz"]) == [
+        ("document", "in"),
+    ]
+    assert find_pairs_for_word("documenting", "xyz", ["in", "go"]) == []
+
+def test_parse_wordlist_file(tmp_path):
+    words = make_word_list(20)
+    filename = write_wordlist(tmp_path / "wordlist.txt", words)
+    assert parse_wordlist_file(filename) == words
+    assert list(iter_wordlist_file(filename)) == words
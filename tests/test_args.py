@@ -0,0 +1,106 @@
+import tracemalloc
+
+import pytest
+
+from args import args
+from args.args import ArgParser, args_schema
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+def parse(arguments):
+    arg_parser = ArgParser(args_schema)
+    arg_parser.parse_args(arguments)
+    return arg_parser
+
+def test_parse_args_without_response_files():
+    arg_parser = parse(["-l", "-p", "8080", "-d", "/tmp/logs"])
+    assert arg_parser.get_arg_value("l") is True
+    assert arg_parser.get_arg_value("p") == 8080
+    assert arg_parser.get_arg_value("d") == "/tmp/logs"
+
+def test_response_file_is_expanded_in_place(tmp_path):
+    # the later value wins, so the order shows where the file was expanded
+    response_file = write(tmp_path / "args.txt", "-p 8080\n-d /tmp/from_file\n")
+    arg_parser = parse(["-p", "1", f"@{response_file}", "-d", "/tmp/after"])
+    assert arg_parser.get_arg_value("p") == 8080
+    assert arg_parser.get_arg_value("d") == "/tmp/after"
+
+def test_nested_response_files(tmp_path):
+    inner = write(tmp_path / "inner.txt", "-p 8080")
+    outer = write(tmp_path / "outer.txt", f"-p 1 @{inner}\n-d /tmp/logs")
+    arg_parser = parse([f"@{outer}"])
+    assert arg_parser.get_arg_value("p") == 8080
+    assert arg_parser.get_arg_value("d") == "/tmp/logs"
+
+def test_comment_lines_are_skipped(tmp_path):
+    response_file = write(tmp_path / "args.txt", "# -p 1\n   # -l\n-d /tmp/logs\n")
+    arg_parser = parse([f"@{response_file}"])
+    assert arg_parser.get_arg_value("p") == 80
+    assert arg_parser.get_arg_value("l") is False
+
+def test_self_reference_raises(tmp_path):
+    response_file = tmp_path / "self.txt"
+    write(response_file, f"-l @{response_file}")
+    with pytest.raises(Exception, match="referenced recursively"):
+        parse([f"@{response_file}", "-d", "x"])
+
+def test_mutual_reference_raises(tmp_path):
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    write(a, f"-l @{b}")
+    write(b, f"-p 1 @{a}")
+    with pytest.raises(Exception, match="referenced recursively"):
+        parse([f"@{a}", "-d", "x"])
+
+def test_same_file_can_be_referenced_twice(tmp_path):
+    response_file = write(tmp_path / "args.txt", "-l")
+    arg_parser = parse([f"@{response_file}", "-d", "x", f"@{response_file}"])
+    assert arg_parser.get_arg_value("l") is True
+
+def count_reads(monkeypatch):
+    reads = []
+    tokenize = ArgParser._tokenize_response_file
+    def counting_tokenize(self, filename):
+        reads.append(filename)
+        return tokenize(self, filename)
+    monkeypatch.setattr(ArgParser, "_tokenize_response_file", counting_tokenize)
+    return reads
+
+def test_repeated_references_are_read_once(tmp_path, monkeypatch):
+    reads = count_reads(monkeypatch)
+    response_file = write(tmp_path / "args.txt", "-l")
+    parse([f"@{response_file}", "-d", "x", f"@{response_file}", f"@{response_file}"])
+    assert len(reads) == 1
+
+def test_changed_files_are_read_again_on_the_next_parse(tmp_path):
+    response_file = tmp_path / "args.txt"
+    write(response_file, "-p 8080 -d x")
+    arg_parser = parse([f"@{response_file}"])
+    write(response_file, "-p 1 -d x")
+    arg_parser.parse_args([f"@{response_file}"])
+    assert arg_parser.get_arg_value("p") == 1
+
+def test_large_response_files_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(args, "RESPONSE_FILE_CACHE_MAX_BYTES", 4)
+    reads = count_reads(monkeypatch)
+    response_file = write(tmp_path / "args.txt", "-p 8080 -d x")
+    arg_parser = parse([f"@{response_file}", f"@{response_file}"])
+    assert len(reads) == 2
+    assert arg_parser.get_arg_value("p") == 8080
+
+def test_large_response_files_are_streamed(tmp_path):
+    response_file = tmp_path / "args.txt"
+    write(response_file, "\n".join(["-p 8080"] * 50000) + "\n-d x")
+    tracemalloc.start()
+    try:
+        parse([f"@{response_file}"])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 100 * 1024
+
+def test_trailing_flag_in_response_file_needs_a_value(tmp_path):
+    response_file = write(tmp_path / "args.txt", "-d x\n-p\n")
+    with pytest.raises(Exception, match="Expected a value to follow arg p"):
+        parse([f"@{response_file}"])
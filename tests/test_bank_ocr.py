@@ -0,0 +1,69 @@
+import ast, os
+
+from bank_ocr.bank_ocr import (
+    classify_account_number,
+    generate_fixed_file,
+    iter_input_file,
+    parse_input_file,
+)
+
+ACCOUNT_NUMBERS_FILE = os.path.join(os.path.dirname(__file__), "..", "bank_ocr", "account_numbers.txt")
+
+# what the original generate_fixed_file wrote for account_numbers.txt
+EXPECTED_LINES = [
+    "000000000",
+    "711111111",
+    "222222222 ERR",
+    "333393333",
+    "444444444 ERR",
+    "555555555 AMB ['555655555', '559555555']",
+    "999999999 AMB ['899999999', '993999999', '999959999']",
+    "000000051",
+    "49006771? ILL",
+    "490067715 AMB ['490067115', '490067719', '490867715']",
+    "1234?678? ILL",
+    "000000051",
+]
+
+def normalise(line):
+    """
+    The guesses of an AMB line come from a set, so sort them before comparing
+    """
+    if " AMB " in line:
+        acc_no, guesses = line.split(" AMB ")
+        return f"{acc_no} AMB {sorted(ast.literal_eval(guesses))}"
+    return line
+
+def write_with_suffix(tmp_path, suffix):
+    with open(ACCOUNT_NUMBERS_FILE) as f:
+        text = f.read()
+    filename = tmp_path / "account_numbers.txt"
+    filename.write_text(text + suffix)
+    return str(filename)
+
+def test_classify_account_number():
+    lines = [classify_account_number(i) for i in parse_input_file(ACCOUNT_NUMBERS_FILE)]
+    assert [normalise(i) for i in lines] == EXPECTED_LINES
+
+def test_generate_fixed_file(tmp_path):
+    output_filename = tmp_path / "outputs.txt"
+    generate_fixed_file(parse_input_file(ACCOUNT_NUMBERS_FILE), str(output_filename))
+    lines = output_filename.read_text().splitlines()
+    assert [normalise(i) for i in lines] == EXPECTED_LINES
+
+def test_readers_match_on_account_numbers_file():
+    account_numbers = list(iter_input_file(ACCOUNT_NUMBERS_FILE))
+    assert account_numbers == parse_input_file(ACCOUNT_NUMBERS_FILE)
+    assert len(account_numbers) == 12
+    assert all(len(i) == 3 for i in account_numbers)
+
+def test_readers_skip_trailing_blank_lines(tmp_path):
+    for suffix in ["\n", "\n\n", "\n\n\n\n\n"]:
+        filename = write_with_suffix(tmp_path, suffix)
+        assert list(iter_input_file(filename)) == parse_input_file(filename)
+        assert len(parse_input_file(filename)) == 12
+
+def test_readers_keep_incomplete_trailing_entries(tmp_path):
+    filename = write_with_suffix(tmp_path, "\n _ \n")
+    assert list(iter_input_file(filename)) == parse_input_file(filename)
+    assert parse_input_file(filename)[-1] == [" _ "]
@@ -0,0 +1,62 @@
+from bench.runner import compare_to_baseline, mann_whitney_p_value, main, load_history, run_benchmark
+
+BASELINE_TIMES = [1.0, 1.1, 1.05, 0.98, 1.02, 1.01, 0.99, 1.03]
+SLOWER_TIMES = [1.3, 1.25, 1.4, 1.28, 1.33, 1.31, 1.29, 1.35]
+
+def result(times):
+    return {"times": times, "median": sorted(times)[len(times) // 2]}
+
+def test_p_value_of_clear_slowdown_is_small():
+    assert mann_whitney_p_value(BASELINE_TIMES, SLOWER_TIMES) < 0.01
+
+def test_p_value_of_speedup_is_large():
+    assert mann_whitney_p_value(SLOWER_TIMES, BASELINE_TIMES) > 0.99
+
+def test_p_value_of_identical_samples():
+    assert mann_whitney_p_value([1.0] * 5, [1.0] * 5) == 1.0
+    assert mann_whitney_p_value(BASELINE_TIMES, BASELINE_TIMES) > 0.4
+
+def test_p_value_with_ties():
+    p_value = mann_whitney_p_value([1.0, 1.0, 2.0, 2.0], [2.0, 2.0, 3.0, 3.0])
+    assert 0.0 < p_value < 0.1
+    assert mann_whitney_p_value([1.0, 1.0, 2.0, 2.0], [1.0, 1.0, 2.0, 2.0]) > 0.4
+
+def test_compare_to_baseline_flags_slowdowns_only():
+    regressions = compare_to_baseline(
+        {"slower": result(SLOWER_TIMES), "same": result(BASELINE_TIMES), "new": result(SLOWER_TIMES)},
+        {"slower": result(BASELINE_TIMES), "same": result(BASELINE_TIMES)},
+        0.05,
+        0.05
+    )
+    assert list(regressions.keys()) == ["slower"]
+
+def test_compare_to_baseline_skips_zero_median():
+    regressions = compare_to_baseline(
+        {"zero": result(SLOWER_TIMES)}, {"zero": result([0.0] * 8)}, 0.05, 0.05
+    )
+    assert regressions == {}
+
+def test_filtered_runs_keep_the_other_baselines(tmp_path):
+    history_file = str(tmp_path / "history.json")
+    main(["-r", "2", "-w", "0", "-k", "bank_ocr.parse_acc_no", "-f", history_file])
+    main(["-r", "2", "-w", "0", "-k", "bank_ocr.parse_input_file", "-f", history_file, "-b"])
+    history = load_history(history_file)
+    assert sorted(history["baseline"]["results"]) == ["bank_ocr.parse_acc_no", "bank_ocr.parse_input_file"]
+    assert len(history["runs"]) == 2
+
+def test_teardown_is_called_after_every_run():
+    calls = []
+    benchmark = {
+        "name": "teardown",
+        "setup": lambda: len(calls),
+        "run": lambda data: calls.append(("run", data)),
+        "teardown": lambda data: calls.append(("teardown", data)),
+    }
+    run_benchmark(benchmark, 1, 2)
+    # warmup, two timed runs and the memory run
+    assert calls == [
+        ("run", 0), ("teardown", 0),
+        ("run", 2), ("teardown", 2),
+        ("run", 4), ("teardown", 4),
+        ("run", 6), ("teardown", 6),
+    ]
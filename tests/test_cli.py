@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from cli.cli import _map, main
+from anagram.bench_cases import SOURCE_WORD, make_word_list
+from test_anagram import original_anagram_kata, write_wordlist
+from test_bank_ocr import ACCOUNT_NUMBERS_FILE, EXPECTED_LINES, normalise, write_with_suffix
+
+MODES = [
+    ["-w", "1"],
+    ["-w", "1", "-s"],
+    ["-w", "2", "-c", "1"],
+    ["-w", "2", "-c", "1", "-s"],
+]
+
+def test_map_keeps_order():
+    for workers in [1, 3]:
+        for stream in [False, True]:
+            assert list(_map(abs, range(-50, 0), workers, 4, stream)) == list(range(50, 0, -1))
+
+def test_map_reads_a_bounded_window_ahead():
+    read = []
+    def numbers():
+        for i in range(1000):
+            read.append(i)
+            yield i
+    results = _map(abs, numbers(), 2, 3, stream=True)
+    assert next(results) == 0
+    assert len(read) <= 8 * 2 * 3
+
+def test_usage(capsys):
+    assert main([]) == 2
+    assert main(["not_a_kata"]) == 2
+    usage = capsys.readouterr().err
+    assert "bank_ocr:" in usage
+    assert "anagram:" in usage
+
+@pytest.mark.parametrize("mode", MODES)
+def test_bank_ocr(tmp_path, mode):
+    output_filename = tmp_path / "outputs.txt"
+    assert main(["bank_ocr", "-i", ACCOUNT_NUMBERS_FILE, "-o", str(output_filename)] + mode) == 0
+    lines = output_filename.read_text().splitlines()
+    assert [normalise(i) for i in lines] == EXPECTED_LINES
+
+@pytest.mark.parametrize("mode", MODES)
+def test_bank_ocr_with_trailing_blank_line(tmp_path, mode):
+    input_filename = write_with_suffix(tmp_path, "\n")
+    output_filename = tmp_path / "outputs.txt"
+    assert main(["bank_ocr", "-i", input_filename, "-o", str(output_filename)] + mode) == 0
+    lines = output_filename.read_text().splitlines()
+    assert [normalise(i) for i in lines] == EXPECTED_LINES
+
+@pytest.mark.parametrize("mode", MODES)
+def test_anagram(tmp_path, mode):
+    words = make_word_list(100)
+    input_filename = write_wordlist(tmp_path / "wordlist.txt", words)
+    output_filename = tmp_path / "pairs.txt"
+    arguments = ["anagram", "-i", input_filename, "-o", str(output_filename), "-x", SOURCE_WORD]
+    assert main(arguments + mode) == 0
+    pairs = [tuple(i.split(" ")) for i in output_filename.read_text().splitlines()]
+    # every pair is only written once
+    assert len(pairs) == len(set(pairs))
+    assert sorted(pairs) == original_anagram_kata(SOURCE_WORD, words)
+
+def test_anagram_to_stdout(tmp_path, capsys):
+    input_filename = write_wordlist(tmp_path / "wordlist.txt", ["doc", "men", "xyz"])
+    assert main(["anagram", "-i", input_filename]) == 0
+    assert capsys.readouterr().out == "doc men\n"
+
+def test_arguments_from_response_file(tmp_path):
+    output_filename = tmp_path / "outputs.txt"
+    response_file = tmp_path / "args.txt"
+    response_file.write_text(f"-i {ACCOUNT_NUMBERS_FILE}\n-o {output_filename}\n-s\n")
+    assert main(["bank_ocr", f"@{response_file}"]) == 0
+    assert len(output_filename.read_text().splitlines()) == len(EXPECTED_LINES)
@@ -0,0 +1,136 @@
+import os, tracemalloc
+
+import pytest
+
+from anagram import anagram
+from anagram.bench_cases import SOURCE_WORD, make_word_list
+from cli.cli import main
+from profiling import profiling
+
+@pytest.fixture(autouse=True)
+def disable_profiling():
+    yield
+    profiling.disable()
+
+class FakeClock:
+    """
+    Stands in for the time module in profiling, so that time
+    only moves on when a test says so
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def profile_parent_and_child(tmp_path, monkeypatch, memory, bookkeeping=0.0):
+    """
+    Profile a parent which does 10s of work itself and calls a child doing
+    100s of work 3 times, with `bookkeeping` seconds spent in the wrapper on
+    every call, and return the collapsed stacks and stats
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(profiling, "time", clock)
+    call_stack = profiling._call_stack
+    def slow_call_stack():
+        clock.advance(bookkeeping)
+        return call_stack()
+    monkeypatch.setattr(profiling, "_call_stack", slow_call_stack)
+    profiling.enable(str(tmp_path), memory=memory)
+    child = profiling._wrap("child", lambda: clock.advance(100))
+    def parent():
+        clock.advance(10)
+        for _ in range(3):
+            child()
+    profiling._wrap("parent", parent)()
+    profiling.disable()
+    return profiling._state["stacks"], profiling.get_stats()
+
+@pytest.mark.parametrize("memory", [False, True])
+def test_self_time_is_split_between_parent_and_child(tmp_path, monkeypatch, memory):
+    stacks, stats = profile_parent_and_child(tmp_path, monkeypatch, memory)
+    assert stacks == {"parent": 10, "parent;child": 300}
+    assert stats["parent"]["cumulative_time"] == 310
+    assert stats["child"]["cumulative_time"] == 300
+    assert stats["child"]["calls"] == 3
+
+@pytest.mark.parametrize("memory", [False, True])
+def test_wrapper_bookkeeping_is_not_charged_to_parent(tmp_path, monkeypatch, memory):
+    stacks, stats = profile_parent_and_child(tmp_path, monkeypatch, memory, bookkeeping=1000)
+    assert stacks == {"parent": 10, "parent;child": 300}
+    assert stats["parent"]["cumulative_time"] == 310
+
+def test_disable_restores_the_original_functions(tmp_path):
+    word_in_parent = anagram.word_in_parent
+    profiling.enable(str(tmp_path), memory=False)
+    assert anagram.word_in_parent is not word_in_parent
+    profiling.disable()
+    assert anagram.word_in_parent is word_in_parent
+
+def test_stats_and_report(tmp_path):
+    profiling.enable(str(tmp_path))
+    anagram.anagram_kata(SOURCE_WORD, make_word_list(20))
+    profiling.disable()
+    stats = profiling.get_stats()
+    assert stats["anagram.anagram.anagram_kata"]["calls"] == 1
+    assert stats["anagram.anagram.find_pairs_for_word"]["calls"] == 20
+    assert stats["anagram.anagram.anagram_kata"]["peak_memory"] > 0
+    profiling.write_report()
+    assert sorted(os.listdir(tmp_path)) == ["collapsed_stacks.txt", "summary.txt"]
+    with open(tmp_path / "collapsed_stacks.txt") as f:
+        for line in f:
+            stack, microseconds = line.rsplit(" ", 1)
+            assert stack.startswith("anagram.anagram.anagram_kata")
+            assert int(microseconds) > 0
+
+def test_tracemalloc_is_stopped_only_if_started_here(tmp_path):
+    profiling.enable(str(tmp_path))
+    assert tracemalloc.is_tracing()
+    profiling.disable()
+    assert not tracemalloc.is_tracing()
+
+def test_outer_tracemalloc_user_is_left_alone(tmp_path):
+    tracemalloc.start()
+    try:
+        data = [0] * 100000
+        del data
+        outer_peak = tracemalloc.get_traced_memory()[1]
+        with pytest.warns(UserWarning, match="already tracing"):
+            profiling.enable(str(tmp_path))
+        anagram.anagram_kata(SOURCE_WORD, make_word_list(20))
+        profiling.disable()
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= outer_peak
+    finally:
+        tracemalloc.stop()
+
+def test_cli_profile_switch_reads_environment(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("KATA_PROFILE_MEMORY", "0")
+    monkeypatch.setenv("KATA_PROFILE_CPROFILE", "1")
+    input_filename = tmp_path / "wordlist.txt"
+    input_filename.write_text("header\n  doc      men\n")
+    assert main(["anagram", "-i", str(input_filename), "-o", "pairs.txt", "-p"]) == 0
+    stats = profiling.get_stats()
+    assert stats["args.args.ArgParser.parse_args"]["calls"] == 1
+    assert all(i["peak_memory"] == 0 for i in stats.values())
+    assert "profile.pstats" in os.listdir(tmp_path / profiling.DEFAULT_OUTPUT_DIR)
+
+@pytest.mark.parametrize("use_switch", [False, True])
+def test_cli_profiles_with_one_worker(tmp_path, monkeypatch, capsys, use_switch):
+    monkeypatch.chdir(tmp_path)
+    input_filename = tmp_path / "wordlist.txt"
+    input_filename.write_text("header\n  doc      men\n")
+    arguments = ["anagram", "-i", str(input_filename), "-o", "pairs.txt", "-w", "2"]
+    if use_switch:
+        arguments.append("-p")
+    else:
+        # as if KATA_PROFILE was set
+        profiling.enable(str(tmp_path / "profile"), memory=False)
+    assert main(arguments) == 0
+    assert "running with 1 worker" in capsys.readouterr().err
+    # the anagram search happened in this process, so it was profiled
+    assert profiling.get_stats()["anagram.anagram.find_pairs_for_word"]["calls"] == 2